@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+check_parse_csynth.py — regression check for parse_csynth.parse_report on csynth report layouts.
+
+Each case is a report fragment and the (clock_ns, Latency_min, Latency_max, II) tuple that the
+original full-text regex parser extracted from it, so the single-pass parser can be checked
+against it whenever parse_report changes.
+
+Usage:
+  python3 fpga/hls/scripts/check_parse_csynth.py
+
+Exits non-zero if any case differs.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from parse_csynth import parse_report
+
+# name -> (report text, expected (clock_ns, lat_min, lat_max, II))
+CASES = {
+    "summary": (
+        "+ Latency:\n"
+        "    * Summary:\n"
+        "        min = 1048590\n"
+        "        max = 1048590\n"
+        "        II = 1\n",
+        (None, 1048590, 1048590, 1)),
+    "blank_between_min_max": (
+        "+ Latency:\n"
+        "    min = 10\n"
+        "\n"
+        "    max = 20\n"
+        "    II = 2\n",
+        (None, 10, 20, 2)),
+    "unrelated_between_min_max": (
+        "+ Latency:\n"
+        "    min = 10\n"
+        "    (see loop table)\n"
+        "    max = 20\n"
+        "    II = 3\n",
+        (None, 10, 20, 3)),
+    # The old parser took min from the first block and max/II from the second;
+    # restarting at the second heading keeps all three from one block.
+    "heading_after_partial": (
+        "+ Latency:\n"
+        "    min = 5\n"
+        "+ Latency:\n"
+        "    min = 6\n"
+        "    max = 7\n"
+        "    II = 4\n",
+        (None, 6, 7, 4)),
+    "lowercase": (
+        "+ latency:\n"
+        "    MIN = 10\n"
+        "    Max = 20\n"
+        "    ii = 3\n",
+        (None, 10, 20, 3)),
+    "alt_one_line": (
+        "Latency (cycles) min = 200 max = 300 average = 250\n"
+        "Interval (II) = 2\n",
+        (None, 200, 300, 2)),
+    "alt_multi_line": (
+        "Latency (cycles)\n"
+        "    min = 200\n"
+        "\n"
+        "    max = 300\n"
+        "    average = 250\n"
+        "Interval (II) = 2\n",
+        (None, 200, 300, 2)),
+    "clock_variants": (
+        "Estimated  clock period : 3.20 ns\n"
+        "interval (II) = 7\n",
+        (3.2, None, None, 7)),
+}
+
+def main():
+    failed = 0
+    for name, (text, expected) in CASES.items():
+        r = parse_report(text.encode().splitlines(keepends=True))
+        got = (r.clock_ns, r.lat_min, r.lat_max, r.II)
+        if got != expected:
+            failed += 1
+            print(f"FAIL {name}: got {got}, expected {expected}")
+    print(f"{len(CASES) - failed}/{len(CASES)} cases passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,40 +11,121 @@ Usage:
 Output CSV columns:
 backend,precision,N,M,iters,clock_ns,Fmax_MHz,Latency_min,Latency_max,II,MLUPS_est,BRAM18K,DSP,FF,LUT
 """
-import re, argparse, csv, os
+import re, argparse, csv, os, mmap
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+from typing import Iterable, Optional
 
 HEADER = ["backend","precision","N","M","iters","clock_ns","Fmax_MHz",
           "Latency_min","Latency_max","II","MLUPS_est","BRAM18K","DSP","FF","LUT","report","timestamp"]
 
-def parse_report(text: str):
-    # Clock period
-    clock_ns = None
-    m = re.search(r"Estimated\s+Clock\s+Period\s*:\s*([\d\.]+)\s*ns", text, re.I)
-    if m: clock_ns = float(m.group(1))
-
-    # Latency section
-    lat_min = lat_max = II = None
-    m = re.search(r"Latency.*?min\s*=\s*(\d+).*\n.*?max\s*=\s*(\d+).*?\n.*?II\s*=\s*(\d+)", text, re.S|re.I)
-    if m:
-        lat_min = int(m.group(1)); lat_max = int(m.group(2)); II = int(m.group(3))
+# Report patterns, compiled once and reused across parse_report calls.
+# Bytes patterns so the report can be scanned straight from an mmap without decoding.
+_RE_CLOCK   = re.compile(rb"Estimated\s+Clock\s+Period\s*:\s*([\d\.]+)\s*ns", re.I)
+_RE_MIN     = re.compile(rb"min\s*=\s*(\d+)", re.I)
+_RE_MAX     = re.compile(rb"max\s*=\s*(\d+)", re.I)
+_RE_II      = re.compile(rb"II\s*=\s*(\d+)", re.I)
+_RE_LAT_ALT = re.compile(rb"Latency\s*\(cycles\)\s*min\s*=\s*(\d+)\s*max\s*=\s*(\d+)\s*average\s*=\s*\d+", re.I)
+_RE_INTERVAL = re.compile(rb"Interval\s*\(II\)\s*=\s*(\d+)", re.I)
+_RE_BRAM    = re.compile(rb"BRAM_18K\s*\|\s*(\d+)")
+_RE_DSP     = re.compile(rb"DSP48E.*?\|\s*(\d+)")
+_RE_FF      = re.compile(rb"FF\s*\|\s*(\d+)")
+_RE_LUT     = re.compile(rb"LUT\s*\|\s*(\d+)")
+
+@dataclass
+class CsynthMetrics:
+    clock_ns: Optional[float] = None
+    lat_min: Optional[int] = None
+    lat_max: Optional[int] = None
+    II: Optional[int] = None
+    bram: Optional[int] = None
+    dsp: Optional[int] = None
+    ff: Optional[int] = None
+    lut: Optional[int] = None
+
+# Latency summary: after the heading (or on it), a "min =" line, then "max =" and
+# "II =" on later lines. Matched one line at a time; blank lines are skipped and
+# each step may be preceded by up to _LAT_WINDOW unrelated lines.
+_LAT_WINDOW = 4
+_LAT_STEPS = (_RE_MIN, _RE_MAX, _RE_II)
+
+# The alternate summary "Latency (cycles) min = .. max = .. average = .." may put each
+# part on its own line; _RE_LAT_ALT only allows whitespace between them, so it is run
+# over the last _ALT_LINES non-blank lines whenever an "average" line is seen.
+_ALT_LINES = 4
+
+# Heading of the resource section; partial/failed syntheses may not have one
+_UTIL_HEADING = b"== Utilization Estimates"
+
+# Single-line rules: (literal prefilter, pattern, field, type). Only the first hit per field is kept.
+# Prefilters are lowercase single words tested against the lowercased line, so they
+# never reject a line their (case-insensitive, \s+-separated) pattern would match.
+_LINE_RULES = [
+    (b"period",   _RE_CLOCK, "clock_ns", float),
+]
+# Resource rows; FF/LUT are too short to prefilter on their own, so all of
+# these only run once the Utilization Estimates section has been entered
+_RESOURCE_RULES = [
+    (b"bram_18k", _RE_BRAM,  "bram",     int),
+    (b"dsp48",    _RE_DSP,   "dsp",      int),
+    (b"ff",       _RE_FF,    "ff",       int),
+    (b"lut",      _RE_LUT,   "lut",      int),
+]
+_ALL_RULES = _LINE_RULES + _RESOURCE_RULES
+
+def _group(m, i: int, conv=int):
+    return conv(m.group(i).decode("ascii"))
+
+def parse_report(lines: Iterable[bytes]) -> CsynthMetrics:
+    # One pass over the report lines (raw bytes, newline kept);
+    # regexes only run on lines whose literal prefilter hits
+    r = CsynthMetrics()
+    lat = lat_alt = alt_II = None
+    lat_step, lat_left, lat_vals = -1, 0, []  # step -1: idle, else index into _LAT_STEPS
+    recent = deque(maxlen=_ALT_LINES)
+    rules = _LINE_RULES
+    for line in lines:
+        low = line.lower()
+        if rules is _LINE_RULES and _UTIL_HEADING in line:
+            rules = _ALL_RULES
+        for lit, pat, field, conv in rules:
+            if lit in low and getattr(r, field) is None:
+                m = pat.search(line)
+                if m: setattr(r, field, _group(m, 1, conv))
+        if lat is None:
+            advanced = False
+            if lat_step >= 0 and line.strip():
+                m = _LAT_STEPS[lat_step].search(line)
+                if m:
+                    lat_vals.append(_group(m, 1)); lat_step += 1; lat_left = _LAT_WINDOW
+                    advanced = True
+                    if lat_step == len(_LAT_STEPS): lat = lat_vals
+                else:
+                    lat_left -= 1
+                    if lat_left < 0: lat_step = -1
+            if not advanced and b"latency" in low:
+                # (Re)start at this heading; "min =" may sit on the heading line itself
+                lat_step, lat_left, lat_vals = 0, _LAT_WINDOW, []
+                m = _RE_MIN.search(line)
+                if m: lat_vals.append(_group(m, 1)); lat_step = 1
+        if line.strip():
+            recent.append(line)
+        if lat_alt is None and b"average" in low:
+            # Alternate format lines
+            lat_alt = _RE_LAT_ALT.search(b"".join(recent))
+        if b"interval" in low and alt_II is None:
+            alt_II = _RE_INTERVAL.search(line)
+
+    if lat:
+        r.lat_min, r.lat_max, r.II = lat
     else:
-        # Alternate format lines
-        m2 = re.search(r"Latency\s*\(cycles\)\s*min\s*=\s*(\d+)\s*max\s*=\s*(\d+)\s*average\s*=\s*\d+", text, re.I)
-        if m2:
-            lat_min = int(m2.group(1)); lat_max = int(m2.group(2))
-        m3 = re.search(r"Interval\s*\(II\)\s*=\s*(\d+)", text, re.I)
-        if m3: II = int(m3.group(1))
-
-    # Resources
-    bram = dsp = ff = lut = None
-    m = re.search(r"BRAM_18K\s*\|\s*(\d+)", text);  bram = int(m.group(1)) if m else None
-    m = re.search(r"DSP48E.*?\|\s*(\d+)", text);    dsp  = int(m.group(1)) if m else None
-    m = re.search(r"FF\s*\|\s*(\d+)", text);        ff   = int(m.group(1)) if m else None
-    m = re.search(r"LUT\s*\|\s*(\d+)", text);       lut  = int(m.group(1)) if m else None
-
-    return clock_ns, lat_min, lat_max, II, bram, dsp, ff, lut
+        if lat_alt:
+            r.lat_min = _group(lat_alt, 1); r.lat_max = _group(lat_alt, 2)
+        if alt_II: r.II = _group(alt_II, 1)
+
+    return r
 
 def main():
     ap = argparse.ArgumentParser()
@@ -57,9 +138,15 @@ def main():
     args = ap.parse_args()
 
     rpt_path = Path(args.report)
-    text = rpt_path.read_text(encoding="utf-8", errors="ignore")
-
-    clock_ns, lat_min, lat_max, II, bram, dsp, ff, lut = parse_report(text)
+    # Map the report read-only and scan it line by line; only touched pages are read
+    with open(rpt_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            r = parse_report([])  # mmap cannot map an empty file
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                r = parse_report(iter(mm.readline, b""))
+    clock_ns, lat_min, lat_max, II = r.clock_ns, r.lat_min, r.lat_max, r.II
+    bram, dsp, ff, lut = r.bram, r.dsp, r.ff, r.lut
     if clock_ns is None or II is None:
         raise SystemExit("Could not parse clock period or II from report.")
 
@@ -73,7 +160,10 @@ def main():
 
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    write_header = (not out_path.exists()) or (out_path.stat().st_size == 0)
+    try:
+        write_header = os.stat(out_path).st_size == 0
+    except FileNotFoundError:
+        write_header = True
     with out_path.open("a", newline="") as f:
         w = csv.writer(f)
         if write_header:
@@ -22,18 +22,29 @@ Notes:
 - The script adds a header if the CSV file does not exist.
 - You can pass multiple --exe flags to run several backends in one sweep.
 - Set different env vars per-exe with --env 'OMP_NUM_THREADS=8' (can repeat).
+- Use --jobs K to run up to K configurations concurrently; with --threads T the
+  pool is capped at cpu_count/T workers. Keep --jobs 1 for timing-sensitive sweeps.
 """
 
 import argparse
 import csv
 import os
+import signal
 import subprocess
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 HEADER = ["backend","precision","N","M","iters","runtime_ms","MLUPS","rel_error","exe","timestamp"]
 
+# Children currently running, so an interrupted sweep can kill them instead of waiting
+_ACTIVE = set()
+_ACTIVE_LOCK = threading.Lock()
+_STOP = threading.Event()
+
 def parse_args():
     p = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     p.add_argument("--exe", action="append", required=True,
@@ -47,17 +58,29 @@ def parse_args():
     p.add_argument("--threads", type=int, default=None, help="OMP threads (if supported).")
     p.add_argument("--env", action="append", default=[],
                    help="Extra env VAR=VALUE (can repeat).")
+    p.add_argument("--jobs", type=int, default=1,
+                   help="Configurations to run concurrently (capped to cpu_count/--threads).")
     p.add_argument("--out", default="results/results.csv", help="Output CSV file.")
     return p.parse_args()
 
 def ensure_header(out_path: Path):
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    if not out_path.exists() or out_path.stat().st_size == 0:
+    try:
+        need_header = os.stat(out_path).st_size == 0
+    except FileNotFoundError:
+        need_header = True
+    if need_header:
         with out_path.open("w", newline="") as f:
             writer = csv.writer(f)
             writer.writerow(HEADER)
 
-def run_once(exe, N, iters, precision, env, threads):
+def _kill(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError):  # no killpg on Windows / already gone
+        proc.kill()
+
+def run_once(exe, N, iters, precision, env, threads, timestamp):
     # We assume N=M (square); adapt if needed.
     cmd = [exe, str(N), str(N), str(iters), precision]
     run_env = os.environ.copy()
@@ -70,16 +93,45 @@ def run_once(exe, N, iters, precision, env, threads):
             run_env[k] = v
 
     try:
-        res = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=run_env, check=True, text=True)
+        # Own process group, so stop_runs can also kill anything the backend spawned
+        # (e.g. a wrapper script's child would otherwise keep the stdout pipe open)
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=run_env, text=True,
+                                start_new_session=True)
     except FileNotFoundError:
         print(f"[ERROR] Executable not found: {exe}", file=sys.stderr)
         return None
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Command failed ({exe}): {e.stderr}", file=sys.stderr)
+    with _ACTIVE_LOCK:
+        _ACTIVE.add(proc)
+        if _STOP.is_set():
+            _kill(proc)
+
+    # Stream stdout instead of buffering it all: only the last non-empty line matters.
+    # stderr is drained on a thread (so neither pipe can fill up) keeping just its tail.
+    err_tail = deque(maxlen=64)
+    err_thread = threading.Thread(target=err_tail.extend, args=(proc.stderr,), daemon=True)
+    err_thread.start()
+    line = ""
+    try:
+        for out_line in proc.stdout:
+            if out_line.strip():
+                line = out_line.strip()
+        proc.wait()
+    except BaseException:
+        _kill(proc)  # e.g. Ctrl-C: don't leave the child running
+        raise
+    finally:
+        err_thread.join()
+        proc.stdout.close()
+        proc.stderr.close()
+        with _ACTIVE_LOCK:
+            _ACTIVE.discard(proc)
+    if _STOP.is_set():
+        return None  # killed by stop_runs; not a backend failure
+    if proc.returncode != 0:
+        print(f"[ERROR] Command failed ({exe}): {''.join(err_tail)}", file=sys.stderr)
         return None
 
     # Expect a single CSV line
-    line = res.stdout.strip().splitlines()[-1] if res.stdout else ""
     if not line or line.count(",") < 6:
         print(f"[WARN] Output did not look like expected CSV: '{line}'", file=sys.stderr)
         return None
@@ -92,30 +144,71 @@ def run_once(exe, N, iters, precision, env, threads):
         return None
 
     # Append exe path and timestamp for traceability
-    parts = parts[:8] + [exe, datetime.utcnow().isoformat(timespec="seconds")]
+    parts = parts[:8] + [exe, timestamp]
     return parts
 
+def run_task(msg, run_args):
+    # Pool entry point: announce the run when it actually starts
+    if _STOP.is_set():
+        return None
+    print(msg, flush=True)
+    return run_once(*run_args)
+
+def stop_runs():
+    # Stop new runs from starting and kill the ones in flight
+    _STOP.set()
+    with _ACTIVE_LOCK:
+        for proc in _ACTIVE:
+            _kill(proc)
+
 def main():
     args = parse_args()
     out_path = Path(args.out).resolve()
     ensure_header(out_path)
 
-    rows = []
-    for exe in args.exe:
-        for N in args.sizes:
-            for precision in args.precisions:
-                for r in range(args.repeats):
-                    print(f"Running: exe={exe} N={N} M={N} iters={args.iters} precision={precision} repeat={r+1}/{args.repeats}")
-                    row = run_once(exe, N, args.iters, precision, args.env, args.threads)
-                    if row:
-                        rows.append(row)
-
-    if rows:
-        with out_path.open("a", newline="") as f:
-            writer = csv.writer(f)
-            for row in rows:
-                writer.writerow(row)
-        print(f"Wrote {len(rows)} rows to {out_path}")
+    # One timestamp per sweep: rows from the same invocation group together
+    sweep_ts = datetime.utcnow().isoformat(timespec="seconds")
+    tasks = [(f"Running: exe={exe} N={N} M={N} iters={args.iters} precision={precision} repeat={r+1}/{args.repeats}",
+              (exe, N, args.iters, precision, args.env, args.threads, sweep_ts))
+             for exe in args.exe
+             for N in args.sizes
+             for precision in args.precisions
+             for r in range(args.repeats)]
+    # Keep concurrent runs from oversubscribing cores when each uses OMP threads
+    max_workers = max(1, args.jobs)
+    if args.threads:
+        max_workers = min(max_workers, max(1, (os.cpu_count() or 1) // args.threads))
+
+    # Append each row as soon as its run finishes. If the sweep is interrupted or
+    # fails, rows from runs that already completed are kept; in-flight runs are killed.
+    n_rows = 0
+    # Runs only wait on a child process, so threads are enough (no spawn/pickling)
+    ex = ThreadPoolExecutor(max_workers=max_workers)
+    with out_path.open("a", newline="") as f:
+        writer = csv.writer(f)
+        futs = [ex.submit(run_task, msg, t) for msg, t in tasks]
+        pending = set(futs)
+        try:
+            for fut in as_completed(futs):
+                pending.discard(fut)
+                row = fut.result()
+                if row:
+                    writer.writerow(row)
+                    n_rows += 1
+        except BaseException:
+            # Ctrl-C or error: drop queued configs and kill running children
+            # instead of letting the pool drain...
+            ex.shutdown(wait=False, cancel_futures=True)
+            stop_runs()
+            # ...but still record runs that had already completed
+            writer.writerows(fut.result() for fut in pending
+                             if fut.done() and not fut.cancelled()
+                             and fut.exception() is None and fut.result())
+            raise
+    ex.shutdown()
+
+    if n_rows:
+        print(f"Wrote {n_rows} rows to {out_path}")
     else:
         print("No rows written; check errors above.")
 
@@ -15,7 +15,8 @@ Usage:
 
 Notes:
 - Expects numeric columns for N, MLUPS, rel_error, etc.
-- One chart per figure (no subplots), matplotlib only, default styles.
+- One chart per image (no subplots), matplotlib only, default styles; a single
+  figure/Axes is reused across charts.
 """
 import argparse
 import os
@@ -23,6 +24,13 @@ from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# Only the plotted columns are parsed; the rest of the results CSV is skipped
+USECOLS = ["backend","precision","N","MLUPS","rel_error"]
+# Nullable Int32 so a missing N becomes NA (dropped later) instead of failing the parse
+DTYPES = {"backend": "category", "precision": "category",
+          "N": "Int32", "MLUPS": "float32", "rel_error": "float64"}
+NUMERIC = ["N","MLUPS","rel_error"]
+
 def parse_args():
     ap = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     ap.add_argument("--csv", default="results/results.csv", help="Input results CSV.")
@@ -32,55 +40,54 @@ def parse_args():
 def load_csv(path: Path) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"CSV not found: {path}")
-    df = pd.read_csv(path)
-    # Basic type enforcement
-    for col in ["N","M","iters"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-    for col in ["runtime_ms","MLUPS","rel_error"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+    # Parse once in C with explicit dtypes instead of re-coercing columns afterwards.
+    # A callable usecols tolerates extra/absent columns (e.g. 8-column executable output),
+    # so ValueError/TypeError here can only come from a dtype conversion.
+    keep = lambda c: c in USECOLS
+    try:
+        df = pd.read_csv(path, usecols=keep, dtype=DTYPES)
+    except pd.errors.ParserError:
+        raise
+    except (ValueError, TypeError):
+        # Non-numeric (or non-integral N) text in a numeric column: coerce it to NA like a missing value
+        df = pd.read_csv(path, usecols=keep, dtype={c: t for c, t in DTYPES.items() if c not in NUMERIC})
+        for col in (c for c in NUMERIC if c in df.columns):
+            vals = pd.to_numeric(df[col], errors="coerce")
+            if DTYPES[col] == "Int32":
+                vals = vals.where(vals % 1 == 0)  # non-integral sizes -> NA
+            df[col] = vals.astype(DTYPES[col])
+    missing = [c for c in USECOLS if c not in df.columns]
+    if missing:
+        raise ValueError(f"CSV {path} lacks columns: {', '.join(missing)}")
     return df
 
-def throughput_vs_size(df: pd.DataFrame, outpath: Path):
-    # Create a combined label "backend-precision"
-    df = df.copy()
-    df["label"] = df["backend"].astype(str) + "-" + df["precision"].astype(str)
-    labels = sorted(df["label"].unique())
+def throughput_vs_size(df: pd.DataFrame, label: pd.Series, labels, ax, outpath: Path):
+    # Mean MLUPS per (label, size) in a single groupby; sorted by label then N
+    agg = df["MLUPS"].groupby([label, df["N"]], observed=True, sort=True).mean()
 
-    plt.figure()  # new figure; no subplots
-    # For each label, plot mean MLUPS per size
+    ax.clear()  # reuse the shared figure; one chart at a time
     for lab in labels:
-        sub = df[df["label"] == lab].groupby("N", as_index=False)["MLUPS"].mean()
-        sub = sub.sort_values("N")
-        plt.plot(sub["N"], sub["MLUPS"], marker="o", label=lab)
-    plt.xlabel("Grid size N (N=M)")
-    plt.ylabel("Throughput (MLUPS)")
-    plt.title("Throughput vs Size")
-    plt.legend()
+        sub = agg.loc[lab]
+        ax.plot(sub.index, sub.values, marker="o", label=lab)
+    ax.set_xlabel("Grid size N (N=M)")
+    ax.set_ylabel("Throughput (MLUPS)")
+    ax.set_title("Throughput vs Size")
+    ax.legend()
     outpath.parent.mkdir(parents=True, exist_ok=True)
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=150)
-    plt.close()
-
-def error_vs_throughput(df: pd.DataFrame, outpath: Path):
-    df = df.copy()
-    df["label"] = df["backend"].astype(str) + "-" + df["precision"].astype(str)
-    labels = sorted(df["label"].unique())
+    ax.figure.savefig(outpath, dpi=150)
 
-    plt.figure()  # new figure
-    for lab in labels:
-        sub = df[df["label"] == lab]
-        plt.scatter(sub["MLUPS"], sub["rel_error"], label=lab, alpha=0.8)
-    plt.xlabel("Throughput (MLUPS)")
-    plt.ylabel("Relative error vs reference")
-    plt.title("Error vs Throughput")
-    plt.yscale("log")  # log scale often helpful for error
-    plt.legend()
+def error_vs_throughput(df: pd.DataFrame, label: pd.Series, ax, outpath: Path):
+    ax.clear()
+    # Groups come out in (sorted) category order
+    for lab, sub in df.groupby(label, observed=True):
+        ax.scatter(sub["MLUPS"], sub["rel_error"], label=lab, alpha=0.8)
+    ax.set_xlabel("Throughput (MLUPS)")
+    ax.set_ylabel("Relative error vs reference")
+    ax.set_title("Error vs Throughput")
+    ax.set_yscale("log")  # log scale often helpful for error
+    ax.legend()
     outpath.parent.mkdir(parents=True, exist_ok=True)
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=150)
-    plt.close()
+    ax.figure.savefig(outpath, dpi=150)
 
 def main():
     args = parse_args()
@@ -88,11 +95,22 @@ def main():
     outdir.mkdir(parents=True, exist_ok=True)
 
     df = load_csv(Path(args.csv))
-    # Drop rows with NaNs in critical columns
-    df = df.dropna(subset=["N","MLUPS","rel_error","backend","precision"])
+    # load_csv returns only the plotted columns, with malformed/missing numeric
+    # fields parsed to NA; drop rows with NA in any of them
+    df = df.dropna()
+
+    # Combined label "backend-precision", built once as a standalone categorical
+    # Series (grouping key) so the frame itself is never copied or widened;
+    # its categories are already the sorted unique labels
+    label = (df["backend"].astype(str) + "-" + df["precision"].astype(str)).astype("category").rename("label")
+    labels = label.cat.categories
 
-    throughput_vs_size(df, outdir / "throughput_vs_size.png")
-    error_vs_throughput(df, outdir / "error_vs_throughput.png")
+    # One figure/Axes reused for every chart instead of a new figure per plot;
+    # constrained layout is solved at draw time, no separate tight_layout pass
+    fig, ax = plt.subplots(constrained_layout=True)
+    throughput_vs_size(df, label, labels, ax, outdir / "throughput_vs_size.png")
+    error_vs_throughput(df, label, ax, outdir / "error_vs_throughput.png")
+    plt.close(fig)
 
     print(f"Wrote plots to {outdir}")
 